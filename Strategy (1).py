@@ -13,304 +13,308 @@ Guidelines followed:
  - Index strategies compute synthetic basket fair values from component mid-prices and trade on premium
 """
 
-from typing import List, Dict
+from typing import List, Dict, Sequence
 from dataclasses import dataclass
+import heapq
 import math
+import sys
 import numpy as np
 
 # Simplified Order and OrderBook datatypes compatible with the backtester interface
-@dataclass
+# slots: no per-instance __dict__ for the many small Orders emitted every tick
+@dataclass(slots=True)
 class Order:
     symbol: str
     price: int
     quantity: int
 
+# shared result for "nothing to quote", so idle products don't allocate a fresh list;
+# get_orders therefore returns a Sequence[Order] (a list, or this empty tuple)
+_EMPTY_ORDERS: Sequence[Order] = ()
+# read-only stand-in for a state that carries no positions
+_NO_POSITIONS: Dict[str, int] = {}
+
+class _BookSide(dict):
+    """price -> volume map that also keeps a heap of its prices, best level on
+    top (bids stored negated). Removed levels are dropped lazily when they
+    surface at the top, so inserts are O(log N) and best-price reads O(1)."""
+    def __init__(self, is_bid: bool):
+        super().__init__()
+        self._sign = -1 if is_bid else 1
+        self._heap: List[int] = []
+
+    @property
+    def best(self):
+        heap = self._heap
+        sign = self._sign
+        while heap and heap[0] * sign not in self:
+            heapq.heappop(heap)
+        return heap[0] * sign if heap else None
+
+    def __setitem__(self, price, volume):
+        if price not in self:
+            heapq.heappush(self._heap, price * self._sign)
+        super().__setitem__(price, volume)
+        if len(self._heap) > 2 * len(self) + 16:
+            # too many stale levels under the top, rebuild from the live prices
+            self._heap = [p * self._sign for p in self.keys()]
+            heapq.heapify(self._heap)
+
+    def setdefault(self, price, volume=None):
+        if price not in self:
+            self[price] = volume
+        return self[price]
+
+    def update(self, *args, **kwargs):
+        for price, volume in dict(*args, **kwargs).items():
+            self[price] = volume
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._heap.clear()
+
+    def __reduce__(self):
+        # pickle/copy restore the levels through __setitem__, so the heap is rebuilt
+        # (dict's default restores items before __dict__, i.e. before _heap exists)
+        return type(self), (self._sign == -1,), None, None, iter(self.items())
+
+
 class OrderBook:
     def __init__(self):
-        self.buy_orders: Dict[int, int] = {}
-        self.sell_orders: Dict[int, int] = {}
+        self.buy_orders: Dict[int, int] = _BookSide(is_bid=True)
+        self.sell_orders: Dict[int, int] = _BookSide(is_bid=False)
+
+    # top of book straight off the side heaps, no max()/min() scan
+    @property
+    def best_bid(self):
+        return self.buy_orders.best
+
+    @property
+    def best_ask(self):
+        return self.sell_orders.best
+
+# top of book for either book type: O(1) off our _BookSide sides, otherwise a
+# scan of the plain dict sides the backtester's own OrderBook carries
+def best_bid(orderbook):
+    side = orderbook.buy_orders
+    if type(side) is _BookSide:
+        return side.best
+    return max(side.keys()) if side else None
+
+def best_ask(orderbook):
+    side = orderbook.sell_orders
+    if type(side) is _BookSide:
+        return side.best
+    return min(side.keys()) if side else None
+
+def mid_price(b, a, offset):
+    # mid of a top of book; a one-sided book is priced offset away from its quoted side
+    if b is None and a is None:
+        return None
+    if b is None:
+        return a - offset
+    if a is None:
+        return b + offset
+    return (a + b) // 2
+
+# sign applied to the position when sizing each side against the position limit
+_SIDE_SIGN = {'buy': -1, 'sell': 1}
 
 # Base class for strategies
 class BaseStrategy:
     def __init__(self, product_name: str, max_position: int):
-        self.product_name = product_name
+        # interned so Order symbols and dict keys share one string object per product
+        self.product_name = sys.intern(product_name)
         self.max_position = max_position
         # ticksize and default order size can be tuned
         self.tick = 2
         self.default_size = max(1, int(max_position/10))
     
-    def _best_bid(self, orderbook: OrderBook):
-        if not orderbook.buy_orders:
-            return None
-        return max(orderbook.buy_orders.keys())
-    
-    def _best_ask(self, orderbook: OrderBook):
-        if not orderbook.sell_orders:
-            return None
-        return min(orderbook.sell_orders.keys())
+    _best_bid = staticmethod(best_bid)
+    _best_ask = staticmethod(best_ask)
     
     def _mid_price(self, orderbook: OrderBook):
-        b = self._best_bid(orderbook)
-        a = self._best_ask(orderbook)
-        if b is None and a is None:
-            return None
-        if b is None:
-            return a - self.tick
-        if a is None:
-            return b + self.tick
-        return (a + b) // 2
+        return mid_price(self._best_bid(orderbook), self._best_ask(orderbook), self.tick)
     
     def _size_allowed(self, position: int, side: str):
-        # side: 'buy' or 'sell'
-        if side == 'buy':
-            allowed = self.max_position - position
-        else:
-            allowed = self.max_position + position  # since position could be negative
-        return max(0, allowed)
-    
-    def get_orders(self, state, orderbook: OrderBook, position: int) -> List[Order]:
-        return []
-
-
-# Simple example product strategies
-class SudowoodoStrategy(BaseStrategy):
-    def __init__(self):
-        super().__init__("SUDOWOODO", 50)
-        # a simple anchored fair value (can be adapted during live/backtest)
-        self.fair_value = 10000
+        # side: 'buy' or 'sell'; position could be negative
+        return max(0, self.max_position + _SIDE_SIGN[side] * position)
     
-    def get_orders(self, state, orderbook, position):
-        orders = []
-        fv = self.fair_value
-        size = min(self.default_size, self._size_allowed(position, 'buy'))
-        sell_size = min(self.default_size, self._size_allowed(position, 'sell'))
-        # place small passive orders around fair value
-        if size > 0:
-            orders.append(Order(self.product_name, fv - self.tick, size))
-        if sell_size > 0:
-            orders.append(Order(self.product_name, fv + self.tick, -sell_size))
-        return orders
-
-
-class DrowzeeStrategy(BaseStrategy):
-    def __init__(self):
-        super().__init__("DROWZEE", 50)
+    def _book_mids(self, state):
+        # mid-price of every two-sided book in the state
+        mids = {}
+        for p, ob in state.order_depth.items():
+            b = self._best_bid(ob)
+            a = self._best_ask(ob)
+            if b is not None and a is not None:
+                mids[p] = (a + b) // 2
+        return mids
     
-    def get_orders(self, state, orderbook, position):
-        orders = []
-        mid = self._mid_price(orderbook)
-        if mid is None:
-            return orders
-        buy_size = min(self.default_size, self._size_allowed(position, 'buy'))
-        sell_size = min(self.default_size, self._size_allowed(position, 'sell'))
-        if buy_size>0:
-            orders.append(Order(self.product_name, mid - self.tick, buy_size))
-        if sell_size>0:
-            orders.append(Order(self.product_name, mid + self.tick, -sell_size))
-        return orders
-
-
-class AbraStrategy(BaseStrategy):
-    def __init__(self):
-        super().__init__("ABRA", 50)
+    def _component_mid(self, orderbook):
+        # index components with a one-sided book are priced one unit off the quoted side
+        if orderbook is None:
+            return None
+        return mid_price(self._best_bid(orderbook), self._best_ask(orderbook), 1)
     
-    def get_orders(self, state, orderbook, position):
-        orders = []
-        mid = self._mid_price(orderbook)
-        if mid is None:
-            return orders
-        # slightly more aggressive sizes if spreads are wide
-        spread = 0
-        b = self._best_bid(orderbook)
-        a = self._best_ask(orderbook)
-        if b is not None and a is not None:
-            spread = a - b
-        size = min(self.default_size + (spread // 5), self._size_allowed(position, 'buy'))
-        sell_size = min(self.default_size + (spread // 5), self._size_allowed(position, 'sell'))
-        if size>0:
-            orders.append(Order(self.product_name, mid - self.tick, size))
-        if sell_size>0:
-            orders.append(Order(self.product_name, mid + self.tick, -sell_size))
-        return orders
+    def get_orders(self, state, orderbook: OrderBook, position: int, mids=None, positions=None) -> Sequence[Order]:
+        # mids: per-tick {product: mid} of two-sided books, computed once by the Trader
+        # positions: the tick's {product: position}, as resolved by the Trader
+        return []
 
 
-# New product strategies (SHINX, LUXRAY, JOLTEON)
-class ShinxStrategy(BaseStrategy):
-    def __init__(self):
-        super().__init__("SHINX", 60)
-        self.tick = 1
-        self.default_size = 3
-    
-    def get_orders(self, state, orderbook, position):
-        orders = []
-        mid = self._mid_price(orderbook)
-        if mid is None:
-            return orders
-        buy_allowed = self._size_allowed(position, 'buy')
-        sell_allowed = self._size_allowed(position, 'sell')
-        # tight market making for SHINX
-        if buy_allowed > 0:
-            orders.append(Order(self.product_name, mid - self.tick, min(self.default_size, buy_allowed)))
-        if sell_allowed > 0:
-            orders.append(Order(self.product_name, mid + self.tick, -min(self.default_size, sell_allowed)))
-        return orders
+# Market-making products: (max_position, tick, default_size, spread_sensitivity, anchored_fv)
+#  - SUDOWOODO, DROWZEE, ABRA (example base products)
+#  - SHINX, LUXRAY, JOLTEON (new products with given position limits)
+# anchored_fv=None quotes around the book mid; spread_sensitivity adds
+# (spread // 5) * spread_sensitivity to the quote size when spreads are wide
+PARAMS = {
+    "SUDOWOODO": (50, 2, 5, 0, 10000),
+    "DROWZEE": (50, 2, 5, 0, None),
+    "ABRA": (50, 2, 5, 1, None),
+    "SHINX": (60, 1, 3, 0, None),
+    "LUXRAY": (250, 3, 8, 0, None),
+    "JOLTEON": (350, 4, 10, 0, None),
+}
 
 
-class LuxrayStrategy(BaseStrategy):
-    def __init__(self):
-        super().__init__("LUXRAY", 250)
-        self.tick = 3
-        self.default_size = 8
-    
-    def get_orders(self, state, orderbook, position):
-        orders = []
-        mid = self._mid_price(orderbook)
-        if mid is None:
-            return orders
-        # slightly larger sizes as Luxray has a larger position limit
-        buy_allowed = self._size_allowed(position, 'buy')
-        sell_allowed = self._size_allowed(position, 'sell')
-        if buy_allowed > 0:
-            orders.append(Order(self.product_name, mid - self.tick, min(self.default_size, buy_allowed)))
-        if sell_allowed > 0:
-            orders.append(Order(self.product_name, mid + self.tick, -min(self.default_size, sell_allowed)))
-        return orders
+def quote(mid, tick, default_size, position, max_position, spread, spread_sens):
+    # integer quoting kernel shared by the market makers: (buy_px, buy_size, sell_px, sell_size)
+    size = default_size + (spread // 5) * spread_sens
+    buy_size = min(size, max(0, max_position - position))
+    sell_size = min(size, max(0, max_position + position))
+    return mid - tick, buy_size, mid + tick, sell_size
 
 
-class JolteonStrategy(BaseStrategy):
-    def __init__(self):
-        super().__init__("JOLTEON", 350)
-        self.tick = 4
-        self.default_size = 10
+class MarketMakerStrategy(BaseStrategy):
+    def __init__(self, product_name: str, max_position: int, tick: int, default_size: int,
+                 spread_sensitivity: int = 0, fair_value=None):
+        super().__init__(product_name, max_position)
+        self.tick = tick
+        self.default_size = default_size
+        self.spread_sensitivity = spread_sensitivity
+        # a simple anchored fair value (can be adapted during live/backtest)
+        self.fair_value = fair_value
     
-    def get_orders(self, state, orderbook, position):
-        orders = []
-        mid = self._mid_price(orderbook)
+    def get_orders(self, state, orderbook, position, mids=None, positions=None) -> Sequence[Order]:
+        # hoist attributes used more than once out of the per-tick path
+        name = self.product_name
+        fv = self.fair_value
+        spread_sens = self.spread_sensitivity
+        # read the top of book once; anchored quoters that ignore the spread skip it
+        b = a = None
+        if fv is None or spread_sens:
+            b = self._best_bid(orderbook)
+            a = self._best_ask(orderbook)
+        mid = fv if fv is not None else mid_price(b, a, self.tick)
         if mid is None:
-            return orders
-        buy_allowed = self._size_allowed(position, 'buy')
-        sell_allowed = self._size_allowed(position, 'sell')
-        # market-making with moderately larger sizes
-        if buy_allowed > 0:
-            orders.append(Order(self.product_name, mid - self.tick, min(self.default_size, buy_allowed)))
-        if sell_allowed > 0:
-            orders.append(Order(self.product_name, mid + self.tick, -min(self.default_size, sell_allowed)))
-        return orders
+            return _EMPTY_ORDERS
+        # slightly more aggressive sizes if spreads are wide
+        spread = a - b if (b is not None and a is not None) else 0
+        buy_px, buy_size, sell_px, sell_size = quote(mid, self.tick, self.default_size, position,
+                                                     self.max_position, spread, spread_sens)
+        # place small passive orders around the anchor
+        if buy_size > 0 and sell_size > 0:
+            return [Order(name, buy_px, buy_size), Order(name, sell_px, -sell_size)]
+        if buy_size > 0:
+            return [Order(name, buy_px, buy_size)]
+        if sell_size > 0:
+            return [Order(name, sell_px, -sell_size)]
+        return _EMPTY_ORDERS
 
 
 # Index strategies: trade index vs synthetic basket (basic premium-arbitrage)
-class AshIndexStrategy(BaseStrategy):
-    def __init__(self):
-        super().__init__("ASH", 60)  # Index position limit as provided
-        # Index composition: 6 Luxrays, 3 Jolteons, 1 Shinx
-        self.weights = {"LUXRAY": 6, "JOLTEON": 3, "SHINX": 1}
-        self.tick = 5
-        self.default_size = 2
+class IndexStrategy(BaseStrategy):
+    def __init__(self, product_name: str, max_position: int, weights: Dict[str, int]):
+        super().__init__(product_name, max_position)
+        self.weights = {sys.intern(p): w for p, w in weights.items()}
+        # component mids and basket price from the last synthetic computation
+        self._last_mids = None
+        self._last_syn = None
     
-    def _synthetic_price(self, state):
+    def _synthetic_price(self, state, mids):
         # compute synthetic index price using component mid-prices
-        mids = {}
-        for p, ob in state.order_depth.items():
-            if p in self.weights:
-                b = None if not ob.buy_orders else max(ob.buy_orders.keys())
-                a = None if not ob.sell_orders else min(ob.sell_orders.keys())
-                if b is None and a is None:
+        component_mids = []
+        for p in self.weights:
+            try:
+                mid = mids[p]
+            except KeyError:
+                # no two-sided book this tick, fall back to the component's own book
+                mid = self._component_mid(state.order_depth.get(p))
+                if mid is None:
                     return None  # cannot compute synthetic
-                mid = (a + b) // 2 if (a is not None and b is not None) else (a - 1 if b is None else b + 1)
-                mids[p] = mid
-        if len(mids) != len(self.weights):
-            return None
-        syn = sum(mids[p] * w for p, w in self.weights.items())
+            component_mids.append(mid)
+        # quiet ticks leave the component mids unchanged, reuse the last basket price
+        key = tuple(component_mids)
+        if key == self._last_mids:
+            return self._last_syn
+        syn = sum(m * w for m, w in zip(key, self.weights.values()))
+        self._last_mids = key
+        self._last_syn = syn
         return syn
     
-    def get_orders(self, state, orderbook, position):
-        orders = []
-        synthetic = self._synthetic_price(state)
+    def _emit_hedge(self, mids, positions, size, side, orders):
+        # component legs of the hedge (notional units scaled by weight): we place
+        # constructive buys at component mid - 1 and sells at mid + 1 to fill
+        sign = 1 if side == 'buy' else -1
+        size_allowed = self._size_allowed
+        for p, w in self.weights.items():
+            mid = mids.get(p)
+            if mid is None:
+                continue
+            qty = min(w * size, size_allowed(positions.get(p, 0), side))
+            if qty > 0:
+                orders.append(Order(p, mid - sign, sign * qty))
+    
+    def get_orders(self, state, orderbook, position, mids=None, positions=None) -> Sequence[Order]:
+        if mids is None:
+            mids = self._book_mids(state)
+        if positions is None:
+            try:
+                positions = state.positions
+            except AttributeError:
+                positions = _NO_POSITIONS
+        synthetic = self._synthetic_price(state, mids)
         index_mid = self._mid_price(orderbook)
         if synthetic is None or index_mid is None:
-            return orders
+            return _EMPTY_ORDERS
+        tick = self.tick
+        name = self.product_name
         premium = index_mid - synthetic
         # If index is trading at a premium, sell index and buy components (and vice-versa)
         size = min(self.default_size, self._size_allowed(position, 'sell' if premium>0 else 'buy'))
         if size <= 0:
-            return orders
-        if premium > self.tick:
+            return _EMPTY_ORDERS
+        if premium > tick:
             # sell index, buy components (we generate one side of the hedge here as orders)
-            orders.append(Order(self.product_name, index_mid, -size))
-            # create corresponding component buy orders (notional units scaled by weight)
-            for p, w in self.weights.items():
-                # we place constructive buys at component mid - 1 tick to fill
-                ob = state.order_depth[p]
-                mid = (max(ob.buy_orders.keys()) + min(ob.sell_orders.keys())) // 2 if ob.buy_orders and ob.sell_orders else None
-                if mid is not None:
-                    qty = min(w * size,  self._size_allowed(state.positions.get(p,0), 'buy'))
-                    if qty>0:
-                        orders.append(Order(p, mid - 1, qty))
-        elif premium < -self.tick:
+            orders = [Order(name, index_mid, -size)]
+            self._emit_hedge(mids, positions, size, 'buy', orders)
+        elif premium < -tick:
             # buy index, sell components
-            orders.append(Order(self.product_name, index_mid, size))
-            for p, w in self.weights.items():
-                ob = state.order_depth[p]
-                mid = (max(ob.buy_orders.keys()) + min(ob.sell_orders.keys())) // 2 if ob.buy_orders and ob.sell_orders else None
-                if mid is not None:
-                    qty = min(w * size,  self._size_allowed(state.positions.get(p,0), 'sell'))
-                    if qty>0:
-                        orders.append(Order(p, mid + 1, -qty))
+            orders = [Order(name, index_mid, size)]
+            self._emit_hedge(mids, positions, size, 'sell', orders)
+        else:
+            return _EMPTY_ORDERS
         return orders
 
 
-class MistyIndexStrategy(BaseStrategy):
+class AshIndexStrategy(IndexStrategy):
+    def __init__(self):
+        # Index composition: 6 Luxrays, 3 Jolteons, 1 Shinx
+        super().__init__("ASH", 60, {"LUXRAY": 6, "JOLTEON": 3, "SHINX": 1})  # Index position limit as provided
+        self.tick = 5
+        self.default_size = 2
+
+
+class MistyIndexStrategy(IndexStrategy):
     def __init__(self):
-        super().__init__("MISTY", 100)
         # Index composition: 4 Luxrays, 2 Jolteons
-        self.weights = {"LUXRAY": 4, "JOLTEON": 2}
+        super().__init__("MISTY", 100, {"LUXRAY": 4, "JOLTEON": 2})
         self.tick = 5
         self.default_size = 3
-    
-    def _synthetic_price(self, state):
-        mids = {}
-        for p, ob in state.order_depth.items():
-            if p in self.weights:
-                b = None if not ob.buy_orders else max(ob.buy_orders.keys())
-                a = None if not ob.sell_orders else min(ob.sell_orders.keys())
-                if b is None and a is None:
-                    return None
-                mid = (a + b) // 2 if (a is not None and b is not None) else (a - 1 if b is None else b + 1)
-                mids[p] = mid
-        if len(mids) != len(self.weights):
-            return None
-        syn = sum(mids[p] * w for p, w in self.weights.items())
-        return syn
-    
-    def get_orders(self, state, orderbook, position):
-        orders = []
-        synthetic = self._synthetic_price(state)
-        index_mid = self._mid_price(orderbook)
-        if synthetic is None or index_mid is None:
-            return orders
-        premium = index_mid - synthetic
-        size = min(self.default_size, self._size_allowed(position, 'sell' if premium>0 else 'buy'))
-        if size<=0:
-            return orders
-        if premium > self.tick:
-            orders.append(Order(self.product_name, index_mid, -size))
-            for p, w in self.weights.items():
-                ob = state.order_depth[p]
-                mid = (max(ob.buy_orders.keys()) + min(ob.sell_orders.keys())) // 2 if ob.buy_orders and ob.sell_orders else None
-                if mid is not None:
-                    qty = min(w * size, self._size_allowed(state.positions.get(p,0), 'buy'))
-                    if qty>0:
-                        orders.append(Order(p, mid - 1, qty))
-        elif premium < -self.tick:
-            orders.append(Order(self.product_name, index_mid, size))
-            for p, w in self.weights.items():
-                ob = state.order_depth[p]
-                mid = (max(ob.buy_orders.keys()) + min(ob.sell_orders.keys())) // 2 if ob.buy_orders and ob.sell_orders else None
-                if mid is not None:
-                    qty = min(w * size, self._size_allowed(state.positions.get(p,0), 'sell'))
-                    if qty>0:
-                        orders.append(Order(p, mid + 1, -qty))
-        return orders
 
 
 # Trader wrapper to plug into the backtester
@@ -318,25 +322,39 @@ class Trader:
     def __init__(self):
         # Map product names used by the backtester to strategy instances
         self.strategies = {
-            "SUDOWOODO": SudowoodoStrategy(),
-            "DROWZEE": DrowzeeStrategy(),
-            "ABRA": AbraStrategy(),
-            "SHINX": ShinxStrategy(),
-            "LUXRAY": LuxrayStrategy(),
-            "JOLTEON": JolteonStrategy(),
-            "ASH": AshIndexStrategy(),
-            "MISTY": MistyIndexStrategy()
+            sys.intern(product): MarketMakerStrategy(product, *params) for product, params in PARAMS.items()
         }
+        self.strategies[sys.intern("ASH")] = AshIndexStrategy()
+        self.strategies[sys.intern("MISTY")] = MistyIndexStrategy()
+        # index components, whose mids are computed once per tick and shared
+        self.components = list(dict.fromkeys(
+            p for strat in self.strategies.values() if isinstance(strat, IndexStrategy) for p in strat.weights
+        ))
     
     def run(self, state):
         result = {}
-        positions = getattr(state, 'positions', {})
-        for product, orderbook in state.order_depth.items():
-            current_position = positions.get(product, 0)
-            strat = self.strategies.get(product)
-            if strat:
-                product_orders = strat.get_orders(state, orderbook, current_position)
+        try:
+            positions = state.positions
+        except AttributeError:
+            positions = _NO_POSITIONS
+        order_depth_get = state.order_depth.get
+        positions_get = positions.get
+        # mids of the components' two-sided books, reused by every index strategy
+        mids = {}
+        for product in self.components:
+            orderbook = order_depth_get(product)
+            if orderbook is None:
+                continue
+            b = best_bid(orderbook)
+            a = best_ask(orderbook)
+            if b is not None and a is not None:
+                mids[product] = (a + b) // 2
+        # products without orders (or without a book this tick) are left out of the result
+        for product, strat in self.strategies.items():
+            orderbook = order_depth_get(product)
+            if orderbook is None:
+                continue
+            product_orders = strat.get_orders(state, orderbook, positions_get(product, 0), mids, positions)
+            if product_orders:
                 result[product] = product_orders
-            else:
-                result[product] = []
         return result
@@ -1,10 +1,12 @@
+from collections import deque
 from typing import List
 from src.backtester import Order, OrderBook
 
 class Trader:
     def __init__(self):
-        self.recent_mid_prices = []
         self.window_size = 10
+        self.recent_mid_prices = deque(maxlen=self.window_size)
+        self.window_sum = 0  # running sum of recent_mid_prices
 
     def run(self, state):
         orders: List[Order] = []
@@ -21,12 +23,13 @@ class Trader:
             best_ask = 10005
 
         mid_price = (best_bid + best_ask) // 2
+        # the deque drops the oldest price itself once full, so take it out of the sum first
+        if len(self.recent_mid_prices) == self.window_size:
+            self.window_sum -= self.recent_mid_prices[0]
         self.recent_mid_prices.append(mid_price)
+        self.window_sum += mid_price
 
-        if len(self.recent_mid_prices) > self.window_size:
-            self.recent_mid_prices.pop(0)
-
-        avg_price = sum(self.recent_mid_prices) // len(self.recent_mid_prices)
+        avg_price = self.window_sum // len(self.recent_mid_prices)
 
         # Mean reversion logic
         if mid_price < avg_price - 1:
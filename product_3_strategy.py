@@ -1,11 +1,16 @@
+from collections import deque
 from typing import List
 from src.backtester import Order, OrderBook
 
 class Trader:
     def __init__(self):
-        self.mid_prices = []
         self.short_window = 5
         self.long_window = 20
+        self.mid_prices = deque(maxlen=self.long_window)
+        self.short_prices = deque(maxlen=self.short_window)
+        # running sums of the two windows
+        self.long_sum = 0
+        self.short_sum = 0
 
     def run(self, state):
         orders: List[Order] = []
@@ -22,21 +27,27 @@ class Trader:
             best_ask = 10005
 
         mid_price = (best_bid + best_ask) // 2
+        # a full deque drops its oldest price on append, so take it out of the sum first
+        if len(self.mid_prices) == self.long_window:
+            self.long_sum -= self.mid_prices[0]
+        if len(self.short_prices) == self.short_window:
+            self.short_sum -= self.short_prices[0]
         self.mid_prices.append(mid_price)
-
-        if len(self.mid_prices) > self.long_window:
-            self.mid_prices.pop(0)
+        self.short_prices.append(mid_price)
+        self.long_sum += mid_price
+        self.short_sum += mid_price
 
         if len(self.mid_prices) < self.long_window:
             return {"PRODUCT3": []}  # not enough data yet
 
-        short_avg = sum(self.mid_prices[-self.short_window:]) / self.short_window
-        long_avg = sum(self.mid_prices) / self.long_window
+        # compare short_sum / short_window against long_sum / long_window without dividing
+        short_scaled = self.short_sum * self.long_window
+        long_scaled = self.long_sum * self.short_window
 
         # Trend following logic
-        if short_avg > long_avg:
+        if short_scaled > long_scaled:
             orders.append(Order("PRODUCT3", best_ask, 10))  # Buy into uptrend
-        elif short_avg < long_avg:
+        elif short_scaled < long_scaled:
             orders.append(Order("PRODUCT3", best_bid, -10))  # Sell into downtrend
 
         return {"PRODUCT3": orders}